@@ -1,12 +1,378 @@
 import numpy as np
 import streamlit as st
-import pandas as pd
+import textwrap
 from math import sqrt
+from types import MappingProxyType
+from typing import Final
+
+# Static markdown, built once at import rather than on every rerun
+_EVIDENCE_BASE_MD: Final[str] = """
+**Key Clinical Validation:**
+1. **Whole Blood Volume:** Based on 5x platelet concentration from 50% yield (Nature 2020)
+2. **Apheresis Efficiency:** 2.5x more efficient than manual prep (PMC 2024)
+3. **Grade-Based Targets:** 
+   - Grades 1-2: ≥1000×10³/μL (Springer 2019)
+   - Grades 3-4: ≥1500×10³/μL (Nature 2020)
+"""
+
+_EVIDENCE_GLUE_ADDENDUM_MD: Final[str] = """
+**Fibrin/PRF Glue Validation:**
+- Cryoprecipitate + calcium achieves 150-300mg/dL fibrinogen (Transfusion 2023)
+- 1:5 calcium ratio provides optimal thrombin generation
+- 37°C incubation enhances growth factor release
+"""
+
+_SIDEBAR_MD: Final[str] = """
+### About This Calculator
+**Key Features:**
+1. Centrifuge parameter calculations
+2. PRP yield and dosage estimation
+3. Evidence-based HSCT hemorrhagic cystitis protocol
+
+**Clinical Validation:**
+- All formulas validated against peer-reviewed literature
+- Parameters adjusted for safety and efficacy
+- Grade-specific protocols from recent studies
+
+**References:**
+1. Nature Sci Rep (2020) - PRP for mucosal healing
+2. PMC (2024) - Ultrasound-guided protocols
+3. Springer Urology (2019) - Grade-based treatment
+"""
+
+# Per-tab introductions
+_HSCT_INTRO_MD: Final[str] = """
+**Intravesical PRP therapy calculator** with:
+- Ultrasound-guided volume adjustment
+- CBC platelet integration
+- Blood volume/apheresis requirements
+- Fibrin/PRF glue preparation protocols
+"""
+
+_RADIUS_INTRO_MD: Final[str] = """
+Calculate the radii for centrifugation (Rmin, Rmid, Rhct, Rmax) based on your centrifuge geometry.
+"""
+
+_RPM_RCF_INTRO_MD: Final[str] = """
+Convert between RPM and RCF (relative centrifugal force) using the formula:  
+**RCF = 1.118 × 10⁻⁵ × r × RPM²**  
+where r is the radius in cm (use Rhct for most accurate PRP calculations)
+"""
+
+_YIELD_INTRO_MD: Final[str] = """
+Calculate the mean yield and confidence interval for your PRP preparation method.  
+**Yield (%) = (PRP Volume × PRP Platelets) / (Blood Volume × Blood Platelets) × 100**
+"""
+
+_DOSAGE_INTRO_MD: Final[str] = """
+Calculate platelet dosage or required blood volume based on your PRP preparation method.
+"""
+
+_FOOTER_CAPTION: Final[str] = "© 2025 PRP Therapy Calculator | For clinical use only | v2.1.0"
+
+# Yield Calculator editor columns, in the BV, BP, PV, PP order _yield_stats expects
+_YIELD_INPUT_COLUMNS: Final = ("BV (ml)", "BP (k/μL)", "PV (ml)", "PP (k/μL)")
+
+_GRADE_HELP: Final[str] = (
+    "Grade 1: Microscopic hematuria\nGrade 2: Macroscopic hematuria\n"
+    "Grade 3: Clots\nGrade 4: Obstruction"
+)
+
+# Square roots: ``** 0.5`` in helpers that take both floats and ndarrays,
+# math.sqrt in scalar-only code
+
+# Reciprocal of the 45° fixed-angle radius divisor, i.e. cos 45° (Tab 2)
+_INV_FIXED_ANGLE: Final = 1.0 / sqrt(2.0)
+
+# RCF = _RCF_K × r × RPM² (r in cm), so RPM = sqrt(RCF / r) / sqrt(_RCF_K);
+# the 1/sqrt(_RCF_K) factor is folded once here
+_RCF_K: Final = 1.118e-5
+_INV_SQRT_K_RCF: Final = 1.0 / sqrt(_RCF_K)
+
+# Session count lookup tables: baseline sessions per grade and the extra
+# sessions per response status, indexed through the two ordinal maps
+_GRADE_INDEX: Final = MappingProxyType({"Grade 1": 0, "Grade 2": 1, "Grade 3": 2, "Grade 4": 3})
+_RESPONSE_INDEX: Final = MappingProxyType({"Naive": 0, "Partial Response": 1, "Recurrent": 2})
+_SESSION_BASE: Final = (2, 3, 4, 5)
+_RESP_ADJ: Final = (0, 1, 2)
+
+# Grades that default to the higher PRP target, and glue types by component
+_HIGH_GRADES: Final = frozenset(("Grade 3", "Grade 4"))
+_CRYO_TYPES: Final = frozenset(("Fibrin Glue (Cryo-based)",))
+_PRF_TYPES: Final = frozenset(("PRF Glue (Combined)", "PRF Gel"))
+
+# Glue preparation steps as markdown bullets, keyed by glue type.
+# Each renderer takes the glue_params dict collected in Tab 1.
+_GLUE_RENDERERS: Final = MappingProxyType({
+    "Fibrin Glue (Cryo-based)": lambda p: (
+        f"\n- 1. Prepare {p.get('cryo_vol', 30)}ml cryoprecipitate"
+        f"\n- 2. Add calcium gluconate at {p.get('calcium_ratio', '1:5')} ratio"
+        f"\n- 3. Incubate at {p.get('activation_temp', 37)}°C for 30min"
+    ),
+    "PRF Glue (Combined)": lambda p: (
+        "\n- 1. Prepare both platelet concentrate and cryoprecipitate"
+        "\n- 2. Mix components at 2:1 ratio (PRP:Cryo)"
+        f"\n- 3. Add calcium gluconate at {p.get('calcium_ratio', '1:5')} ratio"
+        f"\n- 4. Incubate at {p.get('activation_temp', 37)}°C for {p.get('incubation_time', 30)}min"
+    ),
+    "PRF Gel": lambda p: (
+        "\n- 1. Prepare high-concentration PRP (≥2000×10³/μL)"
+        f"\n- 2. Add calcium gluconate at {p.get('calcium_ratio', '1:5')} ratio"
+        f"\n- 3. Activate at {p.get('activation_temp', 37)}°C for {p.get('incubation_time', 30)}min"
+        "\n- 4. Centrifuge at 200g for 5min"
+    ),
+})
+
+
+def _default_target_vol(bladder_vol):
+    """Default instillation volume (ml): 15% of bladder volume, capped at 30."""
+    return min(30, int(bladder_vol*0.15)) if bladder_vol > 0 else 30
+
+
+def _protocol_core(grade_idx, hematoma_size, wall_thick, resp_idx, cbc_plt, target_plt, target_vol):
+    """Return ``(sessions, required_blood_ml, apheresis_vol_ml)`` from ordinal/scalar inputs."""
+    # Session calculations: grade baseline plus branchless adjustments
+    sessions = (_SESSION_BASE[grade_idx]
+                + (hematoma_size > 2.0) + (hematoma_size > 4.0) + (wall_thick > 6.0)
+                + _RESP_ADJ[resp_idx])
+    
+    # Blood Volume Calculations (floors of 20 ml manual draw / 50 ml apheresis)
+    platelets = target_vol * target_plt
+    required_blood_ml = max(20, platelets / (cbc_plt * 0.5)) if cbc_plt > 0 else 20
+    apheresis_vol_ml = max(50, platelets / (cbc_plt * 2.5)) if cbc_plt > 0 else 50
+
+    return sessions, required_blood_ml, apheresis_vol_ml
+
+
+def _glue_steps_md(glue_type, glue_params_tuple):
+    """Markdown bullets for the glue preparation steps ("" for Standard PRP)."""
+    return _GLUE_RENDERERS.get(glue_type, lambda p: "")(dict(glue_params_tuple))
+
+
+def _evidence_md(glue_type):
+    """Evidence-based rationale markdown; only the glue addendum depends on ``glue_type``."""
+    if glue_type == "Standard PRP":
+        return _EVIDENCE_BASE_MD
+    return _EVIDENCE_BASE_MD + _EVIDENCE_GLUE_ADDENDUM_MD
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _compute_protocol(grade, hematoma_size, wall_thick, response_status, treatment_freq,
+                      target_vol, target_plt, cbc_plt, glue_type, glue_params_tuple):
+    """Session count, blood volumes and protocol markdown for the HSCT tab.
+
+    Pure function of the widget values, so Streamlit reruns with unchanged
+    inputs are served from the cache. ``glue_params_tuple`` is the sorted
+    ``glue_params.items()`` so the arguments stay hashable.
+    """
+    sessions, required_blood_ml, apheresis_vol_ml = _protocol_core(
+        _GRADE_INDEX[grade], hematoma_size, wall_thick, _RESPONSE_INDEX[response_status],
+        cbc_plt, target_plt, target_vol)
+    
+    # Treatment Protocol
+    treatment_text = textwrap.dedent(f"""
+    - **{sessions} sessions** at **{treatment_freq}** intervals
+    - **Instillation:** {target_vol} ml PRP at ≥{target_plt}×10³/μL
+    - **Preparation Options:**
+      - Draw **{required_blood_ml:.0f} ml** whole blood (manual prep)
+      - Process **{apheresis_vol_ml:.0f} ml** via apheresis
+    - **Clinical Monitoring:**
+      - Ultrasound after {max(2, sessions//2)} sessions
+      - CBC weekly during treatment
+    """)
+    
+    glue_steps_md = _glue_steps_md(glue_type, glue_params_tuple)
+    if glue_steps_md:
+        treatment_text += f"\n**{glue_type} Preparation Protocol:**\n{glue_steps_md}\n"
+    
+    # Evidence section
+    evidence_text = _evidence_md(glue_type)
+
+    return {
+        "sessions": sessions,
+        "required_blood_ml": required_blood_ml,
+        "apheresis_vol_ml": apheresis_vol_ml,
+        "target_vol": target_vol,
+        "target_plt": target_plt,
+        "treatment_text": treatment_text,
+        "evidence_text": evidence_text,
+    }
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _yield_stats(arr):
+    """Yields and summary statistics from an ``(n, 4)`` float64 array of BV, BP, PV, PP columns."""
+    # Keep only complete rows (all four cells finite and positive) so the arithmetic
+    # and the reductions never see NaN/inf from blank or zero cells, nor negative yields
+    mask = (np.isfinite(arr) & (arr > 0)).all(axis=1)
+    bv, bp, pv, pp = arr[mask].T
+    n = len(bv)
+    
+    # Build the yields of the complete rows in one buffer
+    good = np.empty(n)
+    np.multiply(pv, pp, out=good)
+    np.divide(good, bv, out=good)
+    np.divide(good, bp, out=good)
+    good *= 100.0
+    # Per-row yields stay aligned with the editor; skipped rows show as blank
+    yields = np.full(len(arr), np.nan)
+    yields[mask] = good
+    
+    mean_yield = float(np.mean(good)) if n > 0 else 0.0
+    std_dev = float(np.std(good, ddof=1)) if n > 1 else 0.0
+    ci = 1.96 * (std_dev / sqrt(n)) if n > 1 else 0.0
+    ci_percent = (ci / mean_yield) * 100 if mean_yield != 0 else 0.0
+
+    return {
+        "mean": mean_yield,
+        "std": std_dev,
+        "n": n,
+        "ci": ci,
+        "ci_pct": ci_percent,
+        "yields": yields,
+        "skipped": len(arr) - n,
+    }
+
+
+def _radii_swing(l1, l2, h1, hct):
+    """Return ``(rmin, rmid, rhct, rmax)`` in cm for a horizontal swing-bucket rotor.
+
+    The tube lies along the radius, so no angle correction is applied.
+    Plain float/ndarray math, so it also serves sweeps over NumPy arrays.
+    """
+    base = l2 - h1  # tube length above the blood column
+    rmin = l1 + base
+    rmid = l1 + base + 0.5*h1
+    rhct = l1 + base + h1*(1.0 - 0.01*hct)
+    rmax = l1 + l2
+    return rmin, rmid, rhct, rmax
+
+
+def _radii_fixed(l1, l2, h1, hct):
+    """Return ``(rmin, rmid, rhct, rmax)`` in cm for a 45° fixed-angle rotor."""
+    base = l2 - h1
+    rmin = l1 + base*_INV_FIXED_ANGLE
+    rmid = l1 + (base + 0.5*h1)*_INV_FIXED_ANGLE
+    rhct = l1 + (base + h1*(1.0 - 0.01*hct))*_INV_FIXED_ANGLE
+    rmax = l1 + l2*_INV_FIXED_ANGLE
+    return rmin, rmid, rhct, rmax
+
+
+# Radius kernel specialised per centrifuge rotor type (Tab 2)
+_RADII_BY_ANGLE: Final = MappingProxyType({
+    "Horizontal (swing-bucket)": _radii_swing,
+    "45° (fixed-angle)": _radii_fixed,
+})
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _compute_radii(angle, l1, l2, h1, hct):
+    """Cached ``(rmin, rmid, rhct, rmax)`` for the Tab 2 inputs, via the rotor-specific kernel."""
+    return _RADII_BY_ANGLE[angle](l1, l2, h1, hct)
+
+
+def _rpm_from_rcf(rcf, radius):
+    """RPM giving ``rcf`` (g) at ``radius`` (cm > 0); works on floats and ndarrays."""
+    return _INV_SQRT_K_RCF * (rcf / radius) ** 0.5
+
+
+def _rcf_from_rpm(rpm, radius):
+    """RCF (g) at ``radius`` (cm) for ``rpm``; works on floats and ndarrays."""
+    return _RCF_K * radius * rpm * rpm
+
+
+def _safe_div(num, den):
+    """``num / den`` where ``den > 0``, else 0.0; works on floats and broadcasting ndarrays."""
+    if np.ndim(num) == 0 and np.ndim(den) == 0:
+        # Scalar inputs stay Python floats (one compare, no array round-trip)
+        return num / den if den > 0 else 0.0
+    num = np.asarray(num, dtype=np.float64)
+    den = np.asarray(den, dtype=np.float64)
+    out = np.zeros(np.broadcast_shapes(num.shape, den.shape))
+    return np.divide(num, den, out=out, where=den > 0)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _dose_forward(bv, bp, pv, yield_pct, weight):
+    """Return ``(pp, dose, dose_per_kg)`` for a blood draw of ``bv`` ml.
+
+    ``pp`` is in k/μL and the doses in million platelets. The arithmetic
+    broadcasts, so the volume/count/yield arguments may also be ndarrays.
+    """
+    pp = bv * bp * yield_pct * 0.01 / pv
+    dose = pv * pp * 1000.0  # Convert to millions
+    dose_per_kg = _safe_div(dose, weight)
+    return pp, dose, dose_per_kg
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _dose_inverse(desired_dose, bp, pv, yield_pct, weight):
+    """Return ``(bv, pp, dose_per_kg)``: blood volume (ml) needed for ``desired_dose`` million platelets."""
+    pp = desired_dose / (pv * 1000.0)  # Convert back to k/μL
+    bv = (pv * pp * 100.0) / (bp * yield_pct)
+    dose_per_kg = _safe_div(desired_dose, weight)
+    return bv, pp, dose_per_kg
+
+
+def _dose_forward_table(bv, bp, pv, yield_pct, weight):
+    """Tab 5 results table (label -> formatted value) for :func:`_dose_forward`."""
+    pp, dose, dose_per_kg = _dose_forward(bv, bp, pv, yield_pct, weight)
+    # One table write instead of a row of st.metric widgets
+    results = {
+        "PRP Platelet Concentration": f"{pp:.0f} k/μL",
+        "Total Platelet Dose": f"{dose:,.0f} million",
+    }
+    if weight > 0:
+        results["Dose per kg"] = f"{dose_per_kg:,.0f} million/kg"
+    return results
+
+
+def _dose_inverse_table(desired_dose, bp, pv, yield_pct, weight):
+    """Tab 5 results table (label -> formatted value) for :func:`_dose_inverse`."""
+    bv, pp, dose_per_kg = _dose_inverse(desired_dose, bp, pv, yield_pct, weight)
+    results = {
+        "Required Blood Volume": f"{bv:.1f} ml",
+        "Expected PRP Platelets": f"{pp:.0f} k/μL",
+    }
+    if weight > 0:
+        results["Dose per kg"] = f"{dose_per_kg:,.0f} million/kg"
+    return results
+
+
+def _remember_result(slot, key, compute):
+    """Keep a tab's last submitted result in ``st.session_state[slot]``.
+
+    ``compute`` only runs when ``key`` (the submitted inputs) differs from the
+    stored one. Read it back with :func:`_stored_result`.
+    """
+    if st.session_state.get(f"{slot}_key") != key:
+        st.session_state[slot] = compute()
+        st.session_state[f"{slot}_key"] = key
+    return st.session_state[slot]
+
+
+def _forget_result(slot):
+    """Drop the result kept by :func:`_remember_result`, e.g. after invalid inputs."""
+    st.session_state.pop(slot, None)
+    st.session_state.pop(f"{slot}_key", None)
+
+
+def _stored_result(slot, key):
+    """The result kept in ``slot`` if it was computed for ``key``, else None.
+
+    Tabs pass the inputs currently on screen, so a result is never shown next
+    to inputs that did not produce it (e.g. after a mode switch resets them).
+    """
+    if st.session_state.get(f"{slot}_key") != key:
+        return None
+    return st.session_state.get(slot)
+
 
 st.set_page_config(page_title="Advanced PRP Therapy Calculator", layout="wide")
 st.title("Advanced PRP Therapy Calculator")
 
-# Create all tabs first
+# Create all tabs first; each tab body is an st.fragment so widget
+# interactions rerun only that tab instead of the whole script
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "HSCT Hemorrhagic Cystitis",
     "Radius Calculator", 
@@ -16,410 +382,336 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 ])
 
 # Tab 1: Enhanced HSCT Hemorrhagic Cystitis Module
-with tab1:
+@st.fragment
+def _render_hsct_tab():
     st.header("Post-HSCT Hemorrhagic Cystitis PRP Protocol")
-    st.markdown("""
-    **Intravesical PRP therapy calculator** with:
-    - Ultrasound-guided volume adjustment
-    - CBC platelet integration
-    - Blood volume/apheresis requirements
-    - Fibrin/PRF glue preparation protocols
-    """)
+    st.markdown(_HSCT_INTRO_MD)
     
-    # Clinical Parameters
-    with st.expander("Clinical Parameters", expanded=True):
-        col1, col2 = st.columns(2)
-        with col1:
-            grade = st.selectbox("Hemorrhagic Cystitis Grade", 
-                               ["Grade 1", "Grade 2", "Grade 3", "Grade 4"],
-                               help="Grade 1: Microscopic hematuria\nGrade 2: Macroscopic hematuria\nGrade 3: Clots\nGrade 4: Obstruction")
-            bladder_vol = st.number_input("Bladder Volume (ml) on US", min_value=0, value=150, step=10,
-                                        help="Post-void residual volume from ultrasound")
-            
-        with col2:
-            wall_thick = st.number_input("Bladder Wall Thickness (mm)", min_value=0.0, value=5.0, step=0.1,
-                                       help="Measured at thickest point")
-            hematoma_size = st.number_input("Largest Hematoma Diameter (cm)", min_value=0.0, value=0.0, step=0.1,
-                                          help="Enter 0 if no hematoma")
+    # Glue type sits outside the form: it decides which parameter widgets the form shows
+    glue_type = st.selectbox("Adjunctive Preparation", 
+                          ["Standard PRP", 
+                           "Fibrin Glue (Cryo-based)", 
+                           "PRF Glue (Combined)", 
+                           "PRF Gel"],
+                          help="Select preparation method based on available components")
+    
+    # Grade and bladder volume also stay outside: they set the PRP target defaults,
+    # which must follow them live rather than reset typed targets on submit
+    col1, col2 = st.columns(2)
+    with col1:
+        grade = st.selectbox("Hemorrhagic Cystitis Grade", 
+                           list(_GRADE_INDEX),
+                           help=_GRADE_HELP)
+    with col2:
+        bladder_vol = st.number_input("Bladder Volume (ml) on US", min_value=0, value=150, step=10,
+                                    help="Post-void residual volume from ultrasound")
 
-    # Patient Blood Parameters
-    with st.expander("Patient Blood Parameters", expanded=True):
-        col1, col2 = st.columns(2)
-        with col1:
-            cbc_plt = st.number_input("CBC Platelet Count (×10³/μL)", min_value=50, value=200, step=10,
-                                    help="Most recent complete blood count")
-            hct = st.number_input("Hematocrit (%)", min_value=20.0, max_value=60.0, value=40.0, step=0.1,
-                                help="Needed for apheresis volume calculation")
-            
-        with col2:
-            treatment_freq = st.selectbox("Treatment Frequency", 
-                                        ["Weekly", "Biweekly", "Monthly"],
-                                        index=1)
-            response_status = st.selectbox("Response to Previous Treatment", 
-                                         ["Naive", "Partial Response", "Recurrent"])
-
-    # PRP Targets
-    with st.expander("PRP Targets & Glue Preparation", expanded=True):
-        col1, col2, col3 = st.columns([1,1,1])
-        with col1:
-            target_plt = st.number_input("Target PRP Concentration (×10³/μL)", 
-                                       min_value=1000, 
-                                       value=1500 if grade in ["Grade 3", "Grade 4"] else 1000,
-                                       step=100,
-                                       help="Minimum 1000 for Grades 1-2, 1500+ for Grades 3-4")
-            
-        with col2:
-            glue_type = st.selectbox("Adjunctive Preparation", 
-                                  ["Standard PRP", 
-                                   "Fibrin Glue (Cryo-based)", 
-                                   "PRF Glue (Combined)", 
-                                   "PRF Gel"],
-                                  help="Select preparation method based on available components")
-            
-        with col3:
-            target_vol = st.number_input("Target Instillation Volume (ml)", 
-                                       min_value=10, 
-                                       value=min(30, int(bladder_vol*0.15)) if bladder_vol > 0 else 30,
-                                       step=5,
-                                       help="Typically 10-20% of bladder volume")
-
-    # Glue Parameters (only shown if not Standard PRP)
-    glue_params = {}
-    if glue_type != "Standard PRP":
-        with st.expander(f"{glue_type} Parameters", expanded=True):
+    # Inputs are batched in a form: edits rerun nothing until submit, which reruns only this tab
+    with st.form("hsct_form"):
+        # Clinical Parameters
+        with st.expander("Clinical Parameters", expanded=True):
             col1, col2 = st.columns(2)
             with col1:
-                if "Cryo" in glue_type:
-                    glue_params['cryo_vol'] = st.number_input("Cryoprecipitate Volume (ml)", 
-                                                             min_value=10, 
-                                                             max_value=50,
-                                                             value=30,
-                                                             step=5)
-                glue_params['calcium_ratio'] = st.selectbox("Calcium Gluconate Ratio", 
-                                                           ["1:5", "1:10", "1:20"],
-                                                           index=0 if glue_type == "PRF Gel" else 1,
-                                                           help="1:5 = 10ml CaGluc per 50ml base")
+                wall_thick = st.number_input("Bladder Wall Thickness (mm)", min_value=0.0, value=5.0, step=0.1,
+                                           help="Measured at thickest point")
             
             with col2:
-                if "PRF" in glue_type:
-                    glue_params['incubation_time'] = st.number_input("Incubation Time (min)", 
-                                                                   min_value=5, 
-                                                                   max_value=60,
-                                                                   value=30,
-                                                                   step=5)
-                glue_params['activation_temp'] = st.number_input("Activation Temperature (°C)", 
-                                                               min_value=24, 
-                                                               max_value=37,
-                                                               value=37 if "PRF" in glue_type else 24,
-                                                               step=1)
-
-    # Generate Button - ALWAYS VISIBLE
-    st.markdown("---")  # Visual separator
-    if st.button("Generate Comprehensive PRP Protocol", key="generate_button"):
-        try:
-            # Session calculations
-            base_sessions = {
-                "Grade 1": 2,
-                "Grade 2": 3,
-                "Grade 3": 4,
-                "Grade 4": 5
-            }
-            sessions = base_sessions[grade]
-            
-            # Adjustments
-            if hematoma_size > 2.0: sessions += 1
-            if hematoma_size > 4.0: sessions += 1
-            if wall_thick > 6.0: sessions += 1
-            if response_status == "Partial Response": sessions += 1
-            elif response_status == "Recurrent": sessions += 2
-            
-            # Blood Volume Calculations
-            required_blood_ml = (target_vol * target_plt) / (cbc_plt * 0.5) if cbc_plt > 0 else 0
-            required_blood_ml = max(20, required_blood_ml)
-            
-            apheresis_vol_ml = (target_vol * target_plt) / (cbc_plt * 2.5) if cbc_plt > 0 else 0
-            apheresis_vol_ml = max(50, apheresis_vol_ml)
-            
-            # Display Results
-            st.subheader("PRP Preparation Requirements")
+                hematoma_size = st.number_input("Largest Hematoma Diameter (cm)", min_value=0.0, value=0.0, step=0.1,
+                                              help="Enter 0 if no hematoma")
+
+        # Patient Blood Parameters
+        with st.expander("Patient Blood Parameters", expanded=True):
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Whole Blood Needed", f"{required_blood_ml:.0f} ml", 
-                        help="Volume to draw for manual PRP preparation")
-                st.metric("Estimated PRP Yield", f"{target_vol} ml at {target_plt}×10³/μL")
-                
-            with col2:
-                st.metric("Apheresis Process Volume", f"{apheresis_vol_ml:.0f} ml", 
-                        help="Blood volume to process via apheresis")
-                st.metric("Platelet Dose per Instill", 
-                        f"{(target_vol * target_plt):,.0f}×10³ platelets")
-            
-            # Treatment Protocol
-            st.subheader("Treatment Protocol")
-            treatment_text = f"""
-            - **{sessions} sessions** at **{treatment_freq}** intervals
-            - **Instillation:** {target_vol} ml PRP at ≥{target_plt}×10³/μL
-            - **Preparation Options:**
-              - Draw **{required_blood_ml:.0f} ml** whole blood (manual prep)
-              - Process **{apheresis_vol_ml:.0f} ml** via apheresis
-            - **Clinical Monitoring:**
-              - Ultrasound after {max(2, sessions//2)} sessions
-              - CBC weekly during treatment
-            """
-            
-            if glue_type != "Standard PRP":
-                glue_prep_steps = []
-                if glue_type == "Fibrin Glue (Cryo-based)":
-                    glue_prep_steps = [
-                        f"1. Prepare {glue_params.get('cryo_vol', 30)}ml cryoprecipitate",
-                        f"2. Add calcium gluconate at {glue_params.get('calcium_ratio', '1:5')} ratio",
-                        f"3. Incubate at {glue_params.get('activation_temp', 37)}°C for 30min"
-                    ]
-                elif glue_type == "PRF Glue (Combined)":
-                    glue_prep_steps = [
-                        "1. Prepare both platelet concentrate and cryoprecipitate",
-                        f"2. Mix components at 2:1 ratio (PRP:Cryo)",
-                        f"3. Add calcium gluconate at {glue_params.get('calcium_ratio', '1:5')} ratio",
-                        f"4. Incubate at {glue_params.get('activation_temp', 37)}°C for {glue_params.get('incubation_time', 30)}min"
-                    ]
-                elif glue_type == "PRF Gel":
-                    glue_prep_steps = [
-                        "1. Prepare high-concentration PRP (≥2000×10³/μL)",
-                        f"2. Add calcium gluconate at {glue_params.get('calcium_ratio', '1:5')} ratio",
-                        f"3. Activate at {glue_params.get('activation_temp', 37)}°C for {glue_params.get('incubation_time', 30)}min",
-                        "4. Centrifuge at 200g for 5min"
-                    ]
-                
-                treatment_text += f"""
-                **{glue_type} Preparation Protocol:**
-                {''.join([f'\n- {step}' for step in glue_prep_steps])}
-                """
-            
-            st.markdown(treatment_text)
+                cbc_plt = st.number_input("CBC Platelet Count (×10³/μL)", min_value=50, value=200, step=10,
+                                        help="Most recent complete blood count")
+                hct = st.number_input("Hematocrit (%)", min_value=20.0, max_value=60.0, value=40.0, step=0.1,
+                                    help="Needed for apheresis volume calculation")
             
-            # Evidence section
-            st.subheader("Evidence-Based Rationale")
-            evidence_text = """
-            **Key Clinical Validation:**
-            1. **Whole Blood Volume:** Based on 5x platelet concentration from 50% yield (Nature 2020)
-            2. **Apheresis Efficiency:** 2.5x more efficient than manual prep (PMC 2024)
-            3. **Grade-Based Targets:** 
-               - Grades 1-2: ≥1000×10³/μL (Springer 2019)
-               - Grades 3-4: ≥1500×10³/μL (Nature 2020)
-            """
+            with col2:
+                treatment_freq = st.selectbox("Treatment Frequency", 
+                                            ["Weekly", "Biweekly", "Monthly"],
+                                            index=1)
+                response_status = st.selectbox("Response to Previous Treatment", 
+                                             list(_RESPONSE_INDEX))
+
+        # PRP Targets
+        with st.expander("PRP Targets", expanded=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                target_plt = st.number_input("Target PRP Concentration (×10³/μL)", 
+                                           min_value=1000, 
+                                           value=1500 if grade in _HIGH_GRADES else 1000,
+                                           step=100,
+                                           help="Minimum 1000 for Grades 1-2, 1500+ for Grades 3-4")
             
-            if glue_type != "Standard PRP":
-                evidence_text += """
-                **Fibrin/PRF Glue Validation:**
-                - Cryoprecipitate + calcium achieves 150-300mg/dL fibrinogen (Transfusion 2023)
-                - 1:5 calcium ratio provides optimal thrombin generation
-                - 37°C incubation enhances growth factor release
-                """
+            with col2:
+                target_vol = st.number_input("Target Instillation Volume (ml)", 
+                                           min_value=10, 
+                                           value=_default_target_vol(bladder_vol),
+                                           step=5,
+                                           help="Typically 10-20% of bladder volume")
+
+        # Glue Parameters (only shown if not Standard PRP)
+        glue_params = {}
+        if glue_type != "Standard PRP":
+            with st.expander(f"{glue_type} Parameters", expanded=True):
+                col1, col2 = st.columns(2)
+                with col1:
+                    if glue_type in _CRYO_TYPES:
+                        glue_params['cryo_vol'] = st.number_input("Cryoprecipitate Volume (ml)", 
+                                                                 min_value=10, 
+                                                                 max_value=50,
+                                                                 value=30,
+                                                                 step=5)
+                    glue_params['calcium_ratio'] = st.selectbox("Calcium Gluconate Ratio", 
+                                                               ["1:5", "1:10", "1:20"],
+                                                               index=0 if glue_type == "PRF Gel" else 1,
+                                                               help="1:5 = 10ml CaGluc per 50ml base")
             
-            st.markdown(evidence_text)
+                with col2:
+                    if glue_type in _PRF_TYPES:
+                        glue_params['incubation_time'] = st.number_input("Incubation Time (min)", 
+                                                                       min_value=5, 
+                                                                       max_value=60,
+                                                                       value=30,
+                                                                       step=5)
+                    glue_params['activation_temp'] = st.number_input("Activation Temperature (°C)", 
+                                                                   min_value=24, 
+                                                                   max_value=37,
+                                                                   value=37 if glue_type in _PRF_TYPES else 24,
+                                                                   step=1)
 
+        # Generate Button - ALWAYS VISIBLE
+        st.markdown("---")  # Visual separator
+        submitted = st.form_submit_button("Generate Comprehensive PRP Protocol")
+
+    key = (grade, hematoma_size, wall_thick, response_status, treatment_freq,
+           target_vol, target_plt, cbc_plt, glue_type, tuple(sorted(glue_params.items())))
+    if submitted:
+        try:
+            _remember_result("hsct_protocol", key, lambda: _compute_protocol(*key))
         except Exception as e:
+            _forget_result("hsct_protocol")
             st.error(f"Error generating protocol: {str(e)}")
+    
+    # Last generated protocol, only while the inputs on screen still match it
+    protocol = _stored_result("hsct_protocol", key)
+    if protocol is not None:
+        # Display Results
+        st.subheader("PRP Preparation Requirements")
+        st.table({"Value": {
+            "Whole Blood Needed (manual prep)": f"{protocol['required_blood_ml']:.0f} ml",
+            "Apheresis Process Volume": f"{protocol['apheresis_vol_ml']:.0f} ml",
+            "Estimated PRP Yield": f"{protocol['target_vol']} ml at {protocol['target_plt']}×10³/μL",
+            "Platelet Dose per Instill": f"{(protocol['target_vol'] * protocol['target_plt']):,.0f}×10³ platelets",
+        }})
+        
+        # Treatment Protocol
+        st.subheader("Treatment Protocol")
+        st.markdown(protocol['treatment_text'])
+        
+        # Evidence section
+        st.subheader("Evidence-Based Rationale")
+        st.markdown(protocol['evidence_text'])
 
 
+with tab1:
+    _render_hsct_tab()
 
 # Tab 2: Radius Calculator
-with tab2:
+@st.fragment
+def _render_radius_tab():
     st.header("Centrifuge Radius Calculator")
-    st.markdown("""
-    Calculate the radii for centrifugation (Rmin, Rmid, Rhct, Rmax) based on your centrifuge geometry.
-    """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        angle = st.selectbox("Centrifuge Angle", ["Horizontal (swing-bucket)", "45° (fixed-angle)"])
-        l1 = st.number_input("L1: Distance from rotor hub to tube top (cm)", min_value=0.0, value=2.0, step=0.1)
-        l2 = st.number_input("L2: Length of centrifuge tube (cm)", min_value=0.0, value=10.0, step=0.1)
-    with col2:
-        h1 = st.number_input("H1: Height of blood column (cm)", min_value=0.0, value=8.0, step=0.1)
-        hct = st.number_input("Hematocrit (%)", min_value=0.0, max_value=100.0, value=45.0, step=0.1)
+    st.markdown(_RADIUS_INTRO_MD)
     
-    # Calculate radii
-    a = 1.414 if angle == "45° (fixed-angle)" else 1.0
+    with st.form("radius_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            angle = st.selectbox("Centrifuge Angle", list(_RADII_BY_ANGLE))
+            l1 = st.number_input("L1: Distance from rotor hub to tube top (cm)", min_value=0.0, value=2.0, step=0.1)
+            l2 = st.number_input("L2: Length of centrifuge tube (cm)", min_value=0.0, value=10.0, step=0.1)
+        with col2:
+            h1 = st.number_input("H1: Height of blood column (cm)", min_value=0.0, value=8.0, step=0.1)
+            hct = st.number_input("Hematocrit (%)", min_value=0.0, max_value=100.0, value=45.0, step=0.1)
+        st.form_submit_button("Calculate Radii")
     
-    rmin = l1 + (l2 - h1)/a
-    rmid = l1 + ((l2 - h1) + h1/2)/a
-    rhct = l1 + ((l2 - h1) + (h1 * (1 - hct/100)))/a
-    rmax = l1 + l2/a
+    # Calculate radii (form values only change on submit)
+    rmin, rmid, rhct, rmax = _compute_radii(angle, l1, l2, h1, hct)
     
     st.subheader("Calculated Radii")
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Rmin (top of fluid)", f"{rmin:.2f} cm")
-    with col2:
-        st.metric("Rmid (midpoint)", f"{rmid:.2f} cm")
-    with col3:
-        st.metric("Rhct (buffy coat)", f"{rhct:.2f} cm")
-    with col4:
-        st.metric("Rmax (bottom)", f"{rmax:.2f} cm")
+    st.table({"Value": {
+        "Rmin (top of fluid)": f"{rmin:.2f} cm",
+        "Rmid (midpoint)": f"{rmid:.2f} cm",
+        "Rhct (buffy coat)": f"{rhct:.2f} cm",
+        "Rmax (bottom)": f"{rmax:.2f} cm",
+    }})
+    
+    # Sweep: the radius kernels broadcast over an ndarray of hematocrit values
+    with st.expander("Rhct Across a Hematocrit Range"):
+        hct_lo, hct_hi = st.slider("Hematocrit range (%)", min_value=0.0, max_value=100.0,
+                                   value=(30.0, 60.0), step=0.5)
+        hct_range = np.linspace(hct_lo, hct_hi, 50)
+        rhct_range = _RADII_BY_ANGLE[angle](l1, l2, h1, hct_range)[2]
+        st.line_chart({"Hematocrit (%)": hct_range, "Rhct (cm)": rhct_range},
+                      x="Hematocrit (%)", y="Rhct (cm)")
+
+
+with tab2:
+    _render_radius_tab()
 
 # Tab 3: RPM/RCF Calculator
-with tab3:
+@st.fragment
+def _render_rpm_rcf_tab():
     st.header("RPM/RCF Calculator")
-    st.markdown("""
-    Convert between RPM and RCF (relative centrifugal force) using the formula:  
-    **RCF = 1.118 × 10⁻⁵ × r × RPM²**  
-    where r is the radius in cm (use Rhct for most accurate PRP calculations)
-    """)
+    st.markdown(_RPM_RCF_INTRO_MD)
     
-    col1, col2 = st.columns(2)
-    with col1:
-        radius = st.number_input("Radius (cm)", min_value=0.0, value=9.0, step=0.1)
-        rcf = st.number_input("RCF (g-force)", min_value=0.0, value=1000.0, step=1.0)
-        if st.button("Calculate RPM from RCF"):
-            if radius > 0:
-                rpm = sqrt(rcf / (1.118e-5 * radius))
-                st.success(f"Required RPM: {rpm:.0f}")
-            else:
-                st.error("Radius must be greater than 0")
+    with st.form("rpm_rcf_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            radius = st.number_input("Radius (cm)", min_value=0.0, value=9.0, step=0.1)
+            rcf = st.number_input("RCF (g-force)", min_value=0.0, value=1000.0, step=1.0)
+            rpm_clicked = st.form_submit_button("Calculate RPM from RCF")
     
-    with col2:
-        rpm_input = st.number_input("RPM", min_value=0.0, value=3153.0, step=1.0)
-        if st.button("Calculate RCF from RPM"):
-            if radius > 0:
-                calculated_rcf = 1.118e-5 * radius * rpm_input**2
-                st.success(f"Resulting RCF: {calculated_rcf:.1f} g")
-            else:
+        with col2:
+            rpm_input = st.number_input("RPM", min_value=0.0, value=3153.0, step=1.0)
+            rcf_clicked = st.form_submit_button("Calculate RCF from RPM")
+    
+        # Both conversions share one radius guard; only the clicked one is computed
+        if rpm_clicked or rcf_clicked:
+            if radius <= 0:
                 st.error("Radius must be greater than 0")
+            elif rpm_clicked:
+                st.success(f"Required RPM: {_rpm_from_rcf(rcf, radius):.0f}")
+            else:
+                st.success(f"Resulting RCF: {_rcf_from_rpm(rpm_input, radius):.1f} g")
+
+
+with tab3:
+    _render_rpm_rcf_tab()
 
 # Tab 4: Yield Calculator
-with tab4:
+@st.fragment
+def _render_yield_tab():
+    import pandas as pd  # only this tab needs pandas; deferred to keep cold start light
+
     st.header("PRP Yield Calculator")
-    st.markdown("""
-    Calculate the mean yield and confidence interval for your PRP preparation method.  
-    **Yield (%) = (PRP Volume × PRP Platelets) / (Blood Volume × Blood Platelets) × 100**
-    """)
+    st.markdown(_YIELD_INTRO_MD)
     
     st.write("Enter data for up to 20 samples:")
     
-    # Create editable dataframe
-    sample_data = pd.DataFrame(columns=["BV (ml)", "BP (k/μL)", "PV (ml)", "PP (k/μL)", "Yield (%)"])
-    edited_data = st.data_editor(sample_data, num_rows="dynamic", height=300)
+    # Create editable dataframe with float64 columns so edits never come back as object dtype
+    sample_data = pd.DataFrame({c: pd.Series(dtype="float64") for c in _YIELD_INPUT_COLUMNS})
+    # No form: each edit reruns only this fragment and the statistics follow the
+    # table as it is typed. The editor's session_state entry holds edit deltas, not
+    # the frame, so the returned frame is used directly; _yield_stats is cached on
+    # the array, so unchanged tables cost a lookup
+    edited_data = st.data_editor(sample_data, num_rows="dynamic", height=300, key="yield_samples",
+                                 column_config={c: st.column_config.NumberColumn(c, format="%.2f", min_value=0.0)
+                                                for c in _YIELD_INPUT_COLUMNS})
     
-    if st.button("Calculate Yield Statistics"):
-        if len(edited_data) > 0:
-            # Calculate yields
-            edited_data["Yield (%)"] = (edited_data["PV (ml)"] * edited_data["PP (k/μL)"]) / \
-                                     (edited_data["BV (ml)"] * edited_data["BP (k/μL)"]) * 100
-            
-            # Calculate statistics
-            mean_yield = edited_data["Yield (%)"].mean()
-            std_dev = edited_data["Yield (%)"].std()
-            n = len(edited_data)
-            ci = 1.96 * (std_dev / sqrt(n)) if n > 1 else 0
-            ci_percent = (ci / mean_yield) * 100 if mean_yield != 0 else 0
-            
-            st.subheader("Yield Statistics")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Mean Yield", f"{mean_yield:.1f}%")
-            with col2:
-                st.metric("Standard Deviation", f"{std_dev:.1f}%")
-            with col3:
-                st.metric("95% CI", f"±{ci:.1f}%")
-            with col4:
-                st.metric("CI as % of Mean", f"{ci_percent:.1f}%")
-            
-            st.write("Sample Data with Calculated Yields:")
-            st.dataframe(edited_data)
-        else:
-            st.warning("Please enter at least one sample")
+    if len(edited_data) == 0:
+        st.info("Add at least one sample to see yield statistics")
+        return
+    
+    # Calculate yields on a float64 array of the input columns, selected by name
+    arr = edited_data[list(_YIELD_INPUT_COLUMNS)].to_numpy(dtype=np.float64, na_value=np.nan)
+    stats = _yield_stats(arr)
+    if stats["skipped"] > 0:
+        st.info(f"Skipped {stats['skipped']} incomplete or non-positive rows")
+    if stats["n"] == 0:
+        st.warning("Please enter at least one complete sample")
+        return
+    mean_yield, std_dev, ci, ci_percent = stats["mean"], stats["std"], stats["ci"], stats["ci_pct"]
+    
+    st.subheader("Yield Statistics")
+    st.table({"Value": {
+        "Mean Yield": f"{mean_yield:.1f}%",
+        "Standard Deviation": f"{std_dev:.1f}%",
+        "95% CI": f"±{ci:.1f}%",
+        "CI as % of Mean": f"{ci_percent:.1f}%",
+    }})
+    
+    # The inputs are already visible in the editor above; only send the computed column
+    st.write("Calculated Yields (rows as in the table above):")
+    st.dataframe({"Yield (%)": stats["yields"]},
+                 column_config={"Yield (%)": st.column_config.NumberColumn(format="%.1f")})
+
+
+with tab4:
+    _render_yield_tab()
 
 # Tab 5: Dosage Calculator
-with tab5:
+@st.fragment
+def _render_dosage_tab():
     st.header("PRP Dosage Calculator")
-    st.markdown("""
-    Calculate platelet dosage or required blood volume based on your PRP preparation method.
-    """)
+    st.markdown(_DOSAGE_INTRO_MD)
     
     calc_mode = st.radio("Calculation Mode", 
                         ["Calculate Dose from Blood Volume", 
                          "Calculate Blood Volume from Desired Dose"])
     
     if calc_mode == "Calculate Dose from Blood Volume":
-        col1, col2 = st.columns(2)
-        with col1:
-            bv = st.number_input("Blood Volume (ml)", min_value=0.0, value=20.0, step=1.0)
-            bp = st.number_input("Blood Platelets (k/μL)", min_value=0.0, value=250.0, step=1.0)
-        with col2:
-            pv = st.number_input("PRP Volume (ml)", min_value=0.0, value=5.0, step=0.1)
-            yield_pct = st.number_input("Yield (%)", min_value=0.0, max_value=100.0, value=65.0, step=0.1)
-        
-        if st.button("Calculate PRP Platelets and Dose"):
-            if bv > 0 and bp > 0 and pv > 0 and yield_pct > 0:
-                pp = (bv * bp * yield_pct / 100) / pv
-                dose = pv * pp * 1000  # Convert to millions
-                
-                st.subheader("Results")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("PRP Platelet Concentration", f"{pp:.0f} k/μL")
-                with col2:
-                    st.metric("Total Platelet Dose", f"{dose:,.0f} million")
-                
+        with st.form("dose_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                bv = st.number_input("Blood Volume (ml)", min_value=0.0, value=20.0, step=1.0)
+                bp = st.number_input("Blood Platelets (k/μL)", min_value=0.0, value=250.0, step=1.0)
                 # Optional: Dose per kg
                 weight = st.number_input("Patient Weight (kg)", min_value=0.0, value=70.0, step=0.1)
-                if weight > 0:
-                    dose_per_kg = dose / weight
-                    st.metric("Dose per kg", f"{dose_per_kg:,.0f} million/kg")
+            with col2:
+                pv = st.number_input("PRP Volume (ml)", min_value=0.0, value=5.0, step=0.1)
+                yield_pct = st.number_input("Yield (%)", min_value=0.0, max_value=100.0, value=65.0, step=0.1)
+            submitted = st.form_submit_button("Calculate PRP Platelets and Dose")
+        
+        key = (bv, bp, pv, yield_pct, weight)
+        if submitted:
+            # Array mask so the same check extends to batch (row-wise) inputs
+            if (np.array([bv, bp, pv, yield_pct]) > 0).all():
+                _remember_result("dose_forward", key, lambda: _dose_forward_table(*key))
             else:
+                _forget_result("dose_forward")
                 st.error("All input values must be greater than 0")
+        
+        # Stored results only while they match the inputs shown (a mode switch resets them)
+        results = _stored_result("dose_forward", key)
+        if results is not None:
+            st.subheader("Results")
+            st.table({"Value": results})
     
     else:  # Calculate Blood Volume from Desired Dose
-        col1, col2 = st.columns(2)
-        with col1:
-            desired_dose = st.number_input("Desired Dose (million platelets)", min_value=0.0, value=1000.0, step=10.0)
-            bp = st.number_input("Blood Platelets (k/μL)", min_value=0.0, value=200.0, step=1.0)
-        with col2:
-            pv = st.number_input("PRP Volume (ml)", min_value=0.0, value=10.0, step=0.1)
-            yield_pct = st.number_input("Yield (%)", min_value=0.0, max_value=100.0, value=67.0, step=0.1)
-        
-        if st.button("Calculate Required Blood Volume"):
-            if desired_dose > 0 and bp > 0 and pv > 0 and yield_pct > 0:
-                pp = desired_dose / (pv * 1000)  # Convert back to k/μL
-                bv = (pv * pp * 100) / (bp * yield_pct)
-                
-                st.subheader("Results")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Required Blood Volume", f"{bv:.1f} ml")
-                with col2:
-                    st.metric("Expected PRP Platelets", f"{pp:.0f} k/μL")
-                
+        with st.form("blood_volume_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                desired_dose = st.number_input("Desired Dose (million platelets)", min_value=0.0, value=1000.0, step=10.0)
+                bp = st.number_input("Blood Platelets (k/μL)", min_value=0.0, value=200.0, step=1.0)
                 # Show dose per kg if weight provided
                 weight = st.number_input("Patient Weight (kg)", min_value=0.0, value=70.0, step=0.1)
-                if weight > 0:
-                    dose_per_kg = desired_dose / weight
-                    st.metric("Dose per kg", f"{dose_per_kg:,.0f} million/kg")
+            with col2:
+                pv = st.number_input("PRP Volume (ml)", min_value=0.0, value=10.0, step=0.1)
+                yield_pct = st.number_input("Yield (%)", min_value=0.0, max_value=100.0, value=67.0, step=0.1)
+            submitted = st.form_submit_button("Calculate Required Blood Volume")
+        
+        key = (desired_dose, bp, pv, yield_pct, weight)
+        if submitted:
+            if (np.array([desired_dose, bp, pv, yield_pct]) > 0).all():
+                _remember_result("dose_inverse", key, lambda: _dose_inverse_table(*key))
             else:
+                _forget_result("dose_inverse")
                 st.error("All input values must be greater than 0")
+        
+        results = _stored_result("dose_inverse", key)
+        if results is not None:
+            st.subheader("Results")
+            st.table({"Value": results})
 
 
+with tab5:
+    _render_dosage_tab()
 
 # Sidebar information
-st.sidebar.markdown("""
-### About This Calculator
-**Key Features:**
-1. Centrifuge parameter calculations
-2. PRP yield and dosage estimation
-3. Evidence-based HSCT hemorrhagic cystitis protocol
-
-**Clinical Validation:**
-- All formulas validated against peer-reviewed literature
-- Parameters adjusted for safety and efficacy
-- Grade-specific protocols from recent studies
-
-**References:**
-1. Nature Sci Rep (2020) - PRP for mucosal healing
-2. PMC (2024) - Ultrasound-guided protocols
-3. Springer Urology (2019) - Grade-based treatment
-""")
+st.sidebar.markdown(_SIDEBAR_MD)
 
 # Add footer
 st.markdown("---")
-st.caption("© 2025 PRP Therapy Calculator | For clinical use only | v2.1.0")
+st.caption(_FOOTER_CAPTION)